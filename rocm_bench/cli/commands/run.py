@@ -7,7 +7,6 @@ from pathlib import Path
 import typer
 
 from rocm_bench.cli.common_options import interval_option, output_dir_option
-from rocm_bench.core.services import run_command_and_collect
 
 app = typer.Typer(help="Run an external command under AMD GPU sampling")
 
@@ -47,11 +46,14 @@ def exec_(
         typer.Exit: Exits with the command's exit code.
 
     """
+    # Deferred so `status`/`--help` never pay for loading the GPU backend.
+    from rocm_bench.core.services import run_command_and_collect
+
     extra_dict = {}
     if extra:
         for kv in extra:
-            if "=" in kv:
-                k, v = kv.split("=", 1)
+            k, sep, v = kv.partition("=")
+            if sep:
                 extra_dict[k] = v
             else:
                 typer.echo(f"[warn] ignoring extra '{kv}', expected key=val", err=True)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import heapq
+import os
 from pathlib import Path
 
 import typer
 
+from rocm_bench.utils.helpers import read_json
+
 app = typer.Typer(help="Summarize recent benchmark JSON files.")
 
 
@@ -30,29 +33,21 @@ def list_records(
 
     """
     dir.mkdir(parents=True, exist_ok=True)
-    files = sorted(
-        dir.glob("*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )[:limit]
-    if not files:
-        typer.echo("[status] No records found.")
-        raise typer.Exit(0)
-    dir.mkdir(parents=True, exist_ok=True)
-    files = sorted(
-        dir.glob("*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )[:limit]
-    if not files:
+    with os.scandir(dir) as it:
+        entries = heapq.nlargest(
+            limit,
+            (e for e in it if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+    if not entries:
         typer.echo("[status] No records found.")
         raise typer.Exit(0)
 
-    for f in files:
+    for entry in entries:
         try:
-            data = json.loads(f.read_text(encoding="utf-8"))
+            data = read_json(Path(entry.path))
         except Exception as e:
-            typer.echo(f"- {f.name} (failed to parse: {e})")
+            typer.echo(f"- {entry.name} (failed to parse: {e})")
             continue
         label = data.get("label", "?")
         total = data.get("total_time_seconds")
@@ -60,5 +55,5 @@ def list_records(
         avg = gpu.get("avg_gpu_load_percent")
         mx = gpu.get("max_gpu_load_percent")
         typer.echo(
-            f"- {f.name} | label={label} total={total:.2f}s avg={avg}% max={mx}%"
+            f"- {entry.name} | label={label} total={total:.2f}s avg={avg}% max={mx}%"
         )
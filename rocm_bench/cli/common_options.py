@@ -11,9 +11,17 @@ output_dir_option = typer.Option(
     help="Directory where benchmark JSON files are written.",
 )
 
+
+def _require_positive(value: float) -> float:
+    if value <= 0:
+        raise typer.BadParameter("must be greater than 0.")
+    return value
+
+
 interval_option = typer.Option(
-    0.5,
+    2.0,
     "--interval",
     "-i",
-    help="GPU sampling interval in seconds.",
+    help="GPU sampling interval in seconds (raised up to 10s while load stays steady).",
+    callback=_require_positive,
 )
@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import re
+import os
+import shutil
+import signal
 import subprocess
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from rocm_bench.core.config import APP_TIMEZONE
+from rocm_bench.utils.helpers import write_json
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +28,43 @@ try:  # pragma: no cover
 except Exception:  # pragma: no cover
     pyamdgpuinfo = None  # type: ignore
 
-_SAFE_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+# amdgpu exposes load and VRAM use as plain-text sysfs nodes per DRM card.
+_DRM_ROOT = Path("/sys/class/drm")
+
+# Adaptive back-off: while recent samples show a flat load, sample less often.
+_BACKOFF_WINDOW = 8
+_BACKOFF_STDEV = 0.02
+_BACKOFF_FACTOR = 4
+_MAX_INTERVAL = 10.0
+
+# posix_spawn can honour close_fds=True only where it supports closefrom.
+_POSIX_SPAWN_CLOSEFROM = getattr(subprocess, "_HAVE_POSIX_SPAWN_CLOSEFROM", False)
+
+try:
+    _TZ = ZoneInfo(APP_TIMEZONE)
+except ZoneInfoNotFoundError:  # pragma: no cover (depends on tzdata)
+    _TZ = ZoneInfo("UTC")
+
+_SAFE_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-")
+# 256-entry table mapping every byte outside [A-Za-z0-9._-] to NUL.
+_SLUG_TBL = bytes(c if c in _SAFE_BYTES else 0 for c in range(256))
 
 
 def _slugify(value: str) -> str:
-    s = _SAFE_PATTERN.sub("-", value).strip("-._")
+    raw = value.encode("utf-8", "surrogatepass").translate(_SLUG_TBL).decode("ascii")
+    # Collapse each run of unsafe characters into a single dash.
+    s = "-".join(filter(None, raw.split("\0"))).strip("-._")
     return s or "benchmark"
 
 
+def _file_timestamp(now: datetime) -> str:
+    """Format ``now`` as ``%Y%m%dT%H%M%SZ`` without going through strftime."""
+    return (
+        f"{now.year:04d}{now.month:02d}{now.day:02d}"
+        f"T{now.hour:02d}{now.minute:02d}{now.second:02d}Z"
+    )
+
+
 @dataclass
 class RunResult:
     """Result of running a benchmark command.
@@ -57,11 +90,11 @@ class BenchmarkCollector:
         """Initialize benchmark collector.
 
         Args:
-            output_dir: Directory to store benchmark JSON files.
+            output_dir: Directory to store benchmark JSON files; created on
+                the first write if missing.
 
         """
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def collect(
         self,
@@ -87,11 +120,7 @@ class BenchmarkCollector:
             Path to the generated JSON file.
 
         """
-        try:
-            tz = ZoneInfo(APP_TIMEZONE)
-        except ZoneInfoNotFoundError:
-            tz = ZoneInfo("UTC")
-
+        now = datetime.now(_TZ)
         record = {
             "label": label,
             "cmd": cmd,
@@ -99,64 +128,327 @@ class BenchmarkCollector:
             "runtime_seconds": runtime_seconds,
             "gpu_stats": gpu_stats or {},
             "extra": extra or {},
-            "recorded_at": datetime.now(tz).isoformat(),
+            "recorded_at": now.isoformat(),
         }
 
         slug = _slugify(label or (cmd[0] if cmd else "benchmark"))
-        ts = datetime.now(tz).strftime("%Y%m%dT%H%M%SZ")
+        ts = _file_timestamp(now)
         filename = f"{slug}_{ts}.json"
         out = self.output_dir / filename
-        out.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        try:
+            write_json(out, record)
+        except FileNotFoundError:
+            # Create the directory only when the first write finds it missing.
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            write_json(out, record)
         logger.info("Benchmark written: %s", out)
         return out
 
 
+def _itimer_available() -> bool:
+    """Return whether ``SIGALRM`` can drive sampling without side effects.
+
+    Signal handlers can only be installed from the main thread, and a custom
+    ``SIGALRM`` handler or an already-armed ``ITIMER_REAL`` belongs to
+    someone else.
+    """
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+        and signal.getsignal(signal.SIGALRM) in (signal.SIG_DFL, signal.SIG_IGN)
+        and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    )
+
+
+def _find_sysfs_device() -> Path | None:
+    """Return the device directory of the first DRM card driven by amdgpu.
+
+    ``card0`` is often taken by ``simpledrm`` or another GPU, so cards are
+    scanned in numeric order for one exposing ``gpu_busy_percent``.
+    Connector entries such as ``card1-DP-1`` are skipped.
+    """
+    try:
+        names = [p.name for p in _DRM_ROOT.iterdir()]
+    except OSError:
+        return None
+    cards = sorted(
+        int(name[4:]) for name in names if name.startswith("card") and name[4:].isdigit()
+    )
+    for index in cards:
+        device = _DRM_ROOT / f"card{index}" / "device"
+        if (device / "gpu_busy_percent").exists():
+            return device
+    return None
+
+
+class _SysfsGpu:
+    """Read amdgpu load and VRAM use straight from sysfs, one ``pread`` each.
+
+    Mirrors the ``query_load``/``query_vram_usage`` surface of a
+    ``pyamdgpuinfo`` GPU so the sampler can use either.
+    """
+
+    def __init__(self, device: Path) -> None:
+        """Open the sysfs nodes of ``device``.
+
+        Args:
+            device: amdgpu device directory, e.g. ``/sys/class/drm/card1/device``.
+
+        Raises:
+            OSError: If either node is missing or unreadable.
+
+        """
+        self._fd_load = os.open(device / "gpu_busy_percent", os.O_RDONLY)
+        try:
+            self._fd_vram = os.open(device / "mem_info_vram_used", os.O_RDONLY)
+        except OSError:
+            os.close(self._fd_load)
+            raise
+
+    def query_load(self) -> float:
+        """Return GPU busy time as a fraction from 0 to 1."""
+        return int(os.pread(self._fd_load, 32, 0)) / 100.0
+
+    def query_vram_usage(self) -> int:
+        """Return used VRAM in bytes."""
+        return int(os.pread(self._fd_vram, 32, 0))
+
+    def close(self) -> None:
+        """Close the sysfs file descriptors."""
+        os.close(self._fd_load)
+        os.close(self._fd_vram)
+
+
 class GpuUtilSampler:
-    """Sample AMD GPU utilisation in the background at a fixed interval."""
+    """Sample AMD GPU utilisation at a fixed interval without a helper thread.
+
+    Readings come from amdgpu sysfs nodes when present, falling back to
+    ``pyamdgpuinfo``. Both are direct reads, so no background polling thread
+    is needed: readings are taken while the caller blocks on the benchmarked
+    process (see :meth:`wait`).
+    """
 
-    def __init__(self, interval: float = 0.5) -> None:
+    def __init__(self, interval: float = 2.0) -> None:
         """Initialize GPU utilization sampler.
 
         Args:
-            interval: Sampling interval in seconds.
+            interval: Sampling interval in seconds. While the last few samples
+                show a steady load, it is raised up to ``_MAX_INTERVAL``; it
+                drops back as soon as the load moves.
+
+        Raises:
+            ValueError: If ``interval`` is not positive.
 
         """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval!r}")
         self._interval = interval
-        self._samples: list[tuple[float, float]] = []
-        self._thread: threading.Thread | None = None
-        self._stop_event: threading.Event | None = None
-        self._gpu = None
+        self._base_interval = interval
+        # Recent loads at the base interval, and the load level that triggered
+        # a back-off (None while sampling at the base interval).
+        self._window: deque[float] = deque(maxlen=_BACKOFF_WINDOW)
+        self._steady_load: float | None = None
+        # Only running state is kept: the sample count, the previous reading
+        # (for the trapezoid step) and reductions updated per sample, so
+        # summary() needs no pass and memory stays constant however long the
+        # run.
+        self._n = 0
+        self._load_sum = 0.0
+        self._load_max = 0.0
+        self._vram_sum = 0.0
+        self._vram_max = 0.0
+        self._last_load = 0.0
+        self._last_vram = 0.0
+        # Trapezoidal integrals over sample time for time-weighted averages.
+        self._load_area = 0.0
+        self._vram_area = 0.0
+        self._t_first = 0.0
+        self._t_last = 0.0
+        self._in_tick = False
+        self._gpu: Any = None
+        self._provider = "pyamdgpuinfo"
 
     def start(self) -> bool:
-        """Start GPU utilization sampling in background.
+        """Acquire the GPU handle and take the first sample.
 
         Returns:
             True if sampling started successfully, False otherwise.
 
         """
-        if pyamdgpuinfo is None:  # pragma: no cover (depends on env)
+        device = _find_sysfs_device()
+        if device is not None and self._start_sysfs(device):
+            return True
+        if pyamdgpuinfo is None:
             logger.warning("pyamdgpuinfo not available; GPU sampling disabled.")
             return False
         try:  # pragma: no cover (hardware specific)
             self._gpu = pyamdgpuinfo.get_gpu(0)
+            self._provider = "pyamdgpuinfo"
         except Exception:
             self._gpu = None
             logger.warning("AMD GPU not detected; sampling disabled.")
             return False
-        self._stop_event = threading.Event()
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self.sample()
+        return True
+
+    def _start_sysfs(self, device: Path) -> bool:
+        # Take the first reading here: nodes that open but do not parse mean
+        # sysfs is unusable, so the caller falls back to pyamdgpuinfo.
+        try:
+            gpu = _SysfsGpu(device)
+        except OSError:
+            return False
+        try:
+            load = float(gpu.query_load())
+            vram = float(gpu.query_vram_usage())
+        except (OSError, ValueError):
+            gpu.close()
+            return False
+        self._gpu = gpu
+        self._provider = "sysfs"
+        self._record(load, vram)
         return True
 
+    def sample(self) -> None:
+        """Record one load/VRAM reading; no-op once the GPU stops answering.
+
+        A single unreadable or unparsable reading skips the tick; any other
+        error releases the GPU and ends sampling.
+        """
+        if self._gpu is None:
+            return
+        try:
+            load = float(self._gpu.query_load())
+            vram = float(self._gpu.query_vram_usage())
+        except (OSError, ValueError):
+            return
+        except Exception:
+            self._release()
+            return
+        self._record(load, vram)
+
+    def _record(self, load: float, vram: float) -> None:
+        now = time.monotonic()
+        if self._n:
+            half_dt = (now - self._t_last) / 2
+            self._load_area += (self._last_load + load) * half_dt
+            self._vram_area += (self._last_vram + vram) * half_dt
+        else:
+            self._t_first = now
+        self._t_last = now
+        self._last_load = load
+        self._last_vram = vram
+        self._n += 1
+        self._load_sum += load
+        self._vram_sum += vram
+        self._load_max = max(self._load_max, load)
+        self._vram_max = max(self._vram_max, vram)
+        self._adapt_interval(load)
+
+    def _adapt_interval(self, load: float) -> None:
+        window = self._window
+        if self._steady_load is not None:
+            # Backed off: return to the base interval as soon as load moves.
+            if abs(load - self._steady_load) > _BACKOFF_STDEV:
+                logger.warning(
+                    "GPU load changed; sampling interval restored to %.2fs.",
+                    self._base_interval,
+                )
+                self._interval = self._base_interval
+                self._steady_load = None
+                window.clear()
+                window.append(load)
+            return
+        window.append(load)
+        if len(window) < _BACKOFF_WINDOW or self._base_interval >= _MAX_INTERVAL:
+            return
+        mean = sum(window) / len(window)
+        variance = sum((x - mean) ** 2 for x in window) / len(window)
+        if variance >= _BACKOFF_STDEV**2:
+            return
+        self._interval = min(self._base_interval * _BACKOFF_FACTOR, _MAX_INTERVAL)
+        self._steady_load = mean
+        logger.warning(
+            "GPU load steady; sampling interval raised from %.2fs to %.2fs.",
+            self._base_interval,
+            self._interval,
+        )
+
+    def wait(self, proc: subprocess.Popen) -> int:
+        """Block until ``proc`` exits, sampling once per interval.
+
+        On the main thread of a POSIX interpreter, a ``SIGALRM`` interval
+        timer drives the samples while ``proc.wait()`` blocks in ``waitpid``.
+        Elsewhere, the caller polls on absolute monotonic deadlines instead.
+        Either way, the period does not drift by the time each reading takes.
+        Without a GPU handle (``start()`` failed), this is a plain wait.
+
+        Args:
+            proc: Running process to wait for.
+
+        Returns:
+            Exit code of ``proc``.
+
+        """
+        if self._gpu is None:
+            return proc.wait()
+        if _itimer_available():
+            return self._wait_itimer(proc)
+        return self._wait_polling(proc)
+
+    def _wait_itimer(self, proc: subprocess.Popen) -> int:
+        previous = signal.signal(signal.SIGALRM, self._on_tick)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, self._interval, self._interval)
+            return proc.wait()
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def _on_tick(self, _signum: int, _frame: Any) -> None:
+        # A reading slower than the interval lets the next SIGALRM land inside
+        # this handler; drop that tick instead of sampling re-entrantly.
+        if self._in_tick:
+            return
+        self._in_tick = True
+        try:
+            armed = self._interval
+            self.sample()
+            if self._interval != armed:
+                # sample() backed the interval off; re-arm at the new period.
+                signal.setitimer(signal.ITIMER_REAL, self._interval, self._interval)
+        finally:
+            self._in_tick = False
+
+    def _wait_polling(self, proc: subprocess.Popen) -> int:
+        # Sample on a fixed monotonic grid so query time does not stretch the
+        # period; ticks missed while falling behind are skipped, not replayed.
+        deadline = time.monotonic() + self._interval
+        while True:
+            try:
+                return proc.wait(timeout=max(deadline - time.monotonic(), 0.0))
+            except subprocess.TimeoutExpired:
+                self.sample()
+            # Re-read the interval: sample() may have backed it off.
+            interval = self._interval
+            deadline += interval
+            lag = time.monotonic() - deadline
+            if lag > 0:
+                deadline += (lag // interval + 1) * interval
+
     def stop(self) -> None:
-        """Stop GPU utilization sampling."""
-        if self._stop_event is not None:
-            self._stop_event.set()
-        if self._thread is not None:
-            self._thread.join(timeout=self._interval * 2)
-        # reset handles
-        self._stop_event = None
-        self._thread = None
+        """Take a closing sample, then release the GPU handle.
+
+        The closing sample bounds the last interval, so runs shorter than one
+        interval still get a start and an end reading.
+        """
+        self.sample()
+        self._release()
+
+    def _release(self) -> None:
+        if isinstance(self._gpu, _SysfsGpu):
+            self._gpu.close()
+        self._gpu = None
 
     def summary(self) -> dict[str, Any] | None:
         """Get summary of GPU utilization statistics.
@@ -165,32 +457,56 @@ class GpuUtilSampler:
             Dictionary with GPU statistics if samples available, None otherwise.
 
         """
-        if not self._samples:
+        count = self._n
+        if not count:
             return None
-        loads = [s[0] for s in self._samples]
-        vrams = [s[1] for s in self._samples]
-        count = len(self._samples)
+        span = self._t_last - self._t_first
+        if span > 0:
+            # Weight readings by the time they cover, not by sample count, so
+            # irregular spacing (skipped ticks, the closing sample) cannot bias
+            # the averages.
+            avg_load = self._load_area / span
+            avg_vram = self._vram_area / span
+        else:
+            avg_load = self._load_sum / count
+            avg_vram = self._vram_sum / count
         return {
-            "provider": "pyamdgpuinfo",
+            "provider": self._provider,
             "sample_interval_seconds": self._interval,
             "sample_count": count,
-            "avg_gpu_load_percent": round((sum(loads) / count) * 100, 2),
-            "max_gpu_load_percent": round(max(loads) * 100, 2),
-            "avg_vram_mb": round((sum(vrams) / count) / (1024**2), 2),
-            "max_vram_mb": round(max(vrams) / (1024**2), 2),
+            "avg_gpu_load_percent": round(avg_load * 100, 2),
+            "max_gpu_load_percent": round(self._load_max * 100, 2),
+            "avg_vram_mb": round(avg_vram / (1024**2), 2),
+            "max_vram_mb": round(self._vram_max / (1024**2), 2),
         }
 
-    def _run_loop(self) -> None:
-        if self._gpu is None or self._stop_event is None:
-            return
-        while not self._stop_event.is_set():  # pragma: no cover (hardware specific)
-            try:
-                load = float(self._gpu.query_load())
-                vram = float(self._gpu.query_vram_usage())
-            except Exception:
-                break
-            self._samples.append((load, vram))
-            self._stop_event.wait(self._interval)
+
+@lru_cache(maxsize=16)
+def _get_collector(output_dir: Path) -> BenchmarkCollector:
+    """Return a shared collector for ``output_dir``, creating it on first use."""
+    return BenchmarkCollector(output_dir=output_dir)
+
+
+def _spawn(cmd: list[str]) -> subprocess.Popen:
+    """Start ``cmd`` with inherited descriptors closed, via ``posix_spawn`` if possible.
+
+    ``subprocess`` only takes the ``posix_spawn`` fast path when the
+    executable is given as a path, and with ``close_fds`` only where
+    ``posix_spawn`` can close descriptors itself (CPython 3.13+). There the
+    executable is resolved up front; elsewhere ``Popen`` resolves it as
+    usual. Either way inheritable descriptors rocm-bench was started with
+    (a shell ``3>file`` redirect, a make jobserver pipe) do not reach the
+    command, matching ``subprocess.run``.
+
+    Args:
+        cmd: Command and arguments to execute.
+
+    Returns:
+        The started process.
+
+    """
+    executable = shutil.which(cmd[0]) if cmd and _POSIX_SPAWN_CLOSEFROM else None
+    return subprocess.Popen(cmd, executable=executable, close_fds=True)
 
 
 def run_command_and_collect(
@@ -217,7 +533,7 @@ def run_command_and_collect(
         Tuple of (exit_code, json_path).
 
     """
-    collector = BenchmarkCollector(output_dir=output_dir)
+    collector = _get_collector(Path(output_dir))
 
     if dry_run:
         metadata = dict(extra or {})
@@ -234,14 +550,19 @@ def run_command_and_collect(
         return 0, out
 
     sampler = GpuUtilSampler(interval=interval)
-    started = sampler.start()
-    t0 = time.time()
-    try:
-        proc = subprocess.run(cmd, check=False)
-        code = proc.returncode
-    finally:
-        sampler.stop()
-    t1 = time.time()
+    t0 = time.monotonic()
+    with _spawn(cmd) as proc:
+        # Start sampling only once the child exists so parent-side spawn work
+        # is not attributed to the command.
+        started = sampler.start()
+        try:
+            code = sampler.wait(proc)
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            sampler.stop()
+    t1 = time.monotonic()
 
     total_time = t1 - t0
     gpu_stats = sampler.summary() if started else None
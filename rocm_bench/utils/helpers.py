@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# Match the stdlib fallback: non-str dict keys are stringified, not rejected.
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
 
 
 def ensure_dir(path: Path) -> None:
@@ -12,3 +22,48 @@ def ensure_dir(path: Path) -> None:
         path: Directory path to create.
     """
     path.mkdir(parents=True, exist_ok=True)
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Serialize ``data`` as indented JSON to ``path``.
+
+    Uses ``orjson`` when installed, which encodes straight to bytes; otherwise
+    streams through the stdlib encoder into a buffered file. Both write
+    2-space indented UTF-8 without ``\\u`` escapes and stringify non-str keys.
+    The bytes are not identical: float spelling differs (``1e-05`` vs
+    ``0.00001``), and ``orjson`` writes NaN as ``null`` and rejects integers
+    wider than 64 bits. For the finite floats and small ints in benchmark
+    records, both decode to the same data. No file is left at ``path`` if
+    serialization fails.
+
+    Args:
+        path: Destination file.
+        data: JSON-serializable object.
+
+    Raises:
+        TypeError: If ``data`` contains a value that is not JSON-serializable.
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=_ORJSON_OPTIONS))
+        return
+    try:
+        with path.open("w", encoding="utf-8", buffering=64 * 1024) as fh:
+            json.dump(data, fh, indent=2, ensure_ascii=False)
+    except BaseException:
+        # Don't leave a truncated document behind if encoding fails midway.
+        path.unlink(missing_ok=True)
+        raise
+
+
+def read_json(path: Path) -> Any:
+    """Load a JSON document from ``path``.
+
+    Args:
+        path: JSON file to read.
+
+    Returns:
+        The decoded object.
+    """
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
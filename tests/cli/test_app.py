@@ -1,5 +1,6 @@
 from __future__ import annotations
 import json
+import os
 import subprocess
 from pathlib import Path
 
@@ -29,3 +30,44 @@ def test_cli_run_exec(tmp_path: Path) -> None:
     assert data["label"] == "echo-test"
     assert data["cmd"][-1] == "print('hello')"
     assert "total_time_seconds" in data
+
+def test_cli_status_list__newest_first(tmp_path: Path) -> None:
+    for i, name in enumerate(["old", "mid", "new"]):
+        p = tmp_path / f"{name}.json"
+        p.write_text(json.dumps({"label": name, "total_time_seconds": 1.0}), encoding="utf-8")
+        os.utime(p, (1_000_000 + i, 1_000_000 + i))
+    (tmp_path / "notes.txt").write_text("skip me", encoding="utf-8")
+    cmd = ["python", "-m", "rocm_bench", "status", "list", "--dir", str(tmp_path), "-n", "2"]
+    res = subprocess.run(cmd, check=False, capture_output=True, text=True)
+    assert res.returncode == 0
+    lines = res.stdout.splitlines()
+    assert [line.split(" ")[1] for line in lines] == ["new.json", "mid.json"]
+
+def test_cli_app__import_does_not_load_gpu_backend() -> None:
+    code = (
+        "import sys; import rocm_bench.cli.app; "
+        "sys.exit('rocm_bench.core.services' in sys.modules)"
+    )
+    assert subprocess.run(["python", "-c", code], check=False).returncode == 0
+
+def test_cli_run_exec__parses_extra(tmp_path: Path) -> None:
+    cmd = [
+        "python", "-m", "rocm_bench", "run", "exec", "--label", "x", "--dry-run",
+        "--output-dir", str(tmp_path), "-e", "k=a=b", "-e", "bad", "--", "true",
+    ]
+    res = subprocess.run(cmd, check=False, capture_output=True, text=True)
+    assert res.returncode == 0
+    assert "ignoring extra 'bad'" in res.stderr
+    (path,) = tmp_path.glob("*.json")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["extra"] == {"k": "a=b", "dry_run": True}
+
+def test_cli_run_exec__rejects_non_positive_interval(tmp_path: Path) -> None:
+    cmd = [
+        "python", "-m", "rocm_bench", "run", "exec", "--label", "x", "--interval", "0",
+        "--output-dir", str(tmp_path), "--", "true",
+    ]
+    res = subprocess.run(cmd, check=False, capture_output=True, text=True)
+    assert res.returncode == 2
+    assert "must be greater than 0" in res.stderr
+    assert not list(tmp_path.glob("*.json"))
@@ -1,7 +1,25 @@
 from __future__ import annotations
 import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from rocm_bench.core.services import BenchmarkCollector, GpuUtilSampler
+import pytest
+
+from rocm_bench.core import services
+from rocm_bench.core.services import (
+    BenchmarkCollector,
+    GpuUtilSampler,
+    _file_timestamp,
+    _get_collector,
+    _slugify,
+    _spawn,
+    run_command_and_collect,
+)
 
 def test_collector_roundtrip(tmp_path: Path) -> None:
     c = BenchmarkCollector(output_dir=tmp_path)
@@ -26,3 +44,309 @@ def test_sampler_without_gpu() -> None:
     assert started in (False, True)  # allow either locally
     # Summary should be None if no samples
     assert s.summary() in (None, dict())
+
+class _FakeGpu:
+    def query_load(self) -> float:
+        return 0.5
+
+    def query_vram_usage(self) -> int:
+        return 1024**2
+
+def test_sampler_wait__samples_until_exit() -> None:
+    s = GpuUtilSampler(interval=0.01)
+    s._gpu = _FakeGpu()
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.1)"])
+    assert s.wait(proc) == 0
+    sampled = s._n  # before stop(), which adds the closing sample
+    s.stop()
+    stats = s.summary()
+    assert stats is not None
+    assert sampled >= 2
+    assert stats["sample_count"] == sampled + 1
+    assert stats["avg_gpu_load_percent"] == 50.0
+    assert stats["max_vram_mb"] == 1.0
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("asr infer", "asr-infer"),
+        ("llm/7b  q4", "llm-7b-q4"),
+        ("a--b", "a--b"),
+        ("  .héllo_v1.0! ", "h-llo_v1.0"),
+        ("///", "benchmark"),
+        ("", "benchmark"),
+    ],
+)
+def test_slugify__replaces_unsafe_runs(value: str, expected: str) -> None:
+    assert _slugify(value) == expected
+
+class _SeqGpu:
+    def __init__(self, loads: list[float]) -> None:
+        self._loads = iter(loads)
+
+    def query_load(self) -> float:
+        return next(self._loads)
+
+    def query_vram_usage(self) -> int:
+        return 0
+
+def test_sampler_sample__tracks_running_max_and_count() -> None:
+    s = GpuUtilSampler(interval=1.0)
+    s._gpu = _SeqGpu([0.2, 0.9, 0.4])
+    for _ in range(3):
+        s.sample()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["sample_count"] == 3
+    assert stats["max_gpu_load_percent"] == 90.0
+
+def test_file_timestamp__matches_strftime() -> None:
+    now = datetime(2025, 10, 5, 3, 4, 5, 999999)
+    assert _file_timestamp(now) == now.strftime("%Y%m%dT%H%M%SZ") == "20251005T030405Z"
+
+class _SlowGpu(_FakeGpu):
+    def __init__(self) -> None:
+        self._calls = 0
+
+    def query_load(self) -> float:
+        time.sleep(0.01)
+        self._calls += 1
+        return float(self._calls % 2)  # varying load keeps the interval fixed
+
+@pytest.mark.parametrize("itimer", [True, False], ids=["sigalrm", "polling"])
+def test_sampler_wait__does_not_drift_with_query_time(
+    monkeypatch: pytest.MonkeyPatch, itimer: bool
+) -> None:
+    if not itimer:
+        monkeypatch.setattr(services, "_itimer_available", lambda: False)
+    s = GpuUtilSampler(interval=0.02)
+    s._gpu = _SlowGpu()
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.5)"])
+    t0 = time.monotonic()
+    s.wait(proc)
+    elapsed = time.monotonic() - t0
+    # A drifting loop would only fit elapsed / (interval + 0.01) samples.
+    assert s._n > elapsed / 0.03
+
+def test_run_command_and_collect__reuses_collector(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    created: list[BenchmarkCollector] = []
+
+    class _CountingCollector(BenchmarkCollector):
+        def __init__(self, output_dir: Path | str = "benchmarks") -> None:
+            super().__init__(output_dir)
+            created.append(self)
+
+    monkeypatch.setattr(services, "BenchmarkCollector", _CountingCollector)
+    _get_collector.cache_clear()
+    try:
+        outs = [
+            run_command_and_collect(
+                cmd=["true"], label=f"dry{i}", interval=0.1, output_dir=tmp_path, dry_run=True
+            )[1]
+            for i in range(2)
+        ]
+    finally:
+        _get_collector.cache_clear()
+    assert all(p.parent == tmp_path for p in outs)
+    assert len(created) == 1
+
+def _make_card(root: Path, name: str, *, amdgpu: bool) -> Path:
+    device = root / name / "device"
+    device.mkdir(parents=True)
+    if amdgpu:
+        (device / "gpu_busy_percent").write_text("42\n", encoding="utf-8")
+        (device / "mem_info_vram_used").write_text(f"{2 * 1024**2}\n", encoding="utf-8")
+    return device
+
+def test_find_sysfs_device__picks_first_amdgpu_card(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _make_card(tmp_path, "card0", amdgpu=False)  # e.g. simpledrm
+    _make_card(tmp_path, "card1-DP-1", amdgpu=True)
+    _make_card(tmp_path, "card10", amdgpu=True)
+    expected = _make_card(tmp_path, "card2", amdgpu=True)
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path)
+    assert services._find_sysfs_device() == expected
+
+def test_find_sysfs_device__none_without_amdgpu(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _make_card(tmp_path, "card0", amdgpu=False)
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path)
+    assert services._find_sysfs_device() is None
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path / "missing")
+    assert services._find_sysfs_device() is None
+
+def test_sampler_start__reads_sysfs_nodes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _make_card(tmp_path, "card1", amdgpu=True)
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path)
+    s = GpuUtilSampler(interval=0.01)
+    assert s.start() is True
+    s.stop()
+    s.stop()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["provider"] == "sysfs"
+    assert stats["avg_gpu_load_percent"] == 42.0
+    assert stats["max_vram_mb"] == 2.0
+
+def test_sampler_start__falls_back_when_sysfs_unparsable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    device = _make_card(tmp_path, "card1", amdgpu=True)
+    (device / "gpu_busy_percent").write_text("", encoding="utf-8")
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path)
+    monkeypatch.setattr(services, "pyamdgpuinfo", None)
+    s = GpuUtilSampler(interval=0.01)
+    assert s.start() is False
+    assert s._gpu is None
+    assert "pyamdgpuinfo not available" in caplog.text
+
+def test_sampler_sample__skips_unreadable_tick(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    device = _make_card(tmp_path, "card1", amdgpu=True)
+    monkeypatch.setattr(services, "_DRM_ROOT", tmp_path)
+    s = GpuUtilSampler(interval=0.01)
+    assert s.start() is True
+    (device / "gpu_busy_percent").write_text("", encoding="utf-8")
+    s.sample()
+    (device / "gpu_busy_percent").write_text("42\n", encoding="utf-8")
+    s.sample()
+    s.stop()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["provider"] == "sysfs"
+    assert stats["sample_count"] == 3
+
+def test_sampler_summary__weights_average_by_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([0.0, 1.0, 3.0])
+    monkeypatch.setattr(services.time, "monotonic", lambda: next(clock))
+    s = GpuUtilSampler(interval=1.0)
+    s._gpu = _SeqGpu([0.0, 1.0, 1.0])
+    s.sample()
+    s.sample()
+    s.stop()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["sample_count"] == 3
+    # 0.5 load-seconds over [0, 1] plus 2.0 over [1, 3], across 3 s.
+    assert stats["avg_gpu_load_percent"] == 83.33
+    assert stats["max_gpu_load_percent"] == 100.0
+
+def test_collector_collect__filename_matches_recorded_at(tmp_path: Path) -> None:
+    p = BenchmarkCollector(output_dir=tmp_path).collect(label="ts", cmd=["x"], total_time=0.0)
+    data = json.loads(p.read_text(encoding="utf-8"))
+    recorded = datetime.fromisoformat(data["recorded_at"])
+    assert p.name == f"ts_{_file_timestamp(recorded)}.json"
+
+def test_collector_collect__creates_missing_output_dir(tmp_path: Path) -> None:
+    outdir = tmp_path / "a" / "b"
+    c = BenchmarkCollector(output_dir=outdir)
+    assert not outdir.exists()
+    p = c.collect(label="lazy", cmd=["x"], total_time=0.0)
+    assert p.parent == outdir
+    assert p.exists()
+
+def test_sampler_sample__backs_off_on_steady_load(caplog: pytest.LogCaptureFixture) -> None:
+    s = GpuUtilSampler(interval=1.0)
+    s._gpu = _FakeGpu()
+    for _ in range(8):
+        s.sample()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["sample_interval_seconds"] == 4.0
+    assert "sampling interval raised from 1.00s to 4.00s" in caplog.text
+
+def test_sampler_sample__keeps_interval_on_varying_load() -> None:
+    s = GpuUtilSampler(interval=1.0)
+    s._gpu = _SeqGpu([0.0, 1.0] * 4)
+    for _ in range(8):
+        s.sample()
+    stats = s.summary()
+    assert stats is not None
+    assert stats["sample_interval_seconds"] == 1.0
+
+def test_sampler_wait__restores_sigalrm_and_disarms_timer() -> None:
+    before = signal.getsignal(signal.SIGALRM)
+    s = GpuUtilSampler(interval=0.01)
+    s._gpu = _SlowGpu()
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.1)"])
+    assert s.wait(proc) == 0
+    assert s._n >= 1
+    assert signal.getsignal(signal.SIGALRM) is before
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+def _no_setitimer(*args: object) -> None:
+    raise AssertionError("setitimer must not be armed")
+
+def test_sampler_wait__polls_off_main_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(services.signal, "setitimer", _no_setitimer)
+    s = GpuUtilSampler(interval=0.01)
+    s._gpu = _SlowGpu()
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+    codes: list[int] = []
+    t = threading.Thread(target=lambda: codes.append(s.wait(proc)))
+    t.start()
+    t.join()
+    assert codes == [0]
+    assert s._n >= 5
+
+def test_sampler_wait__skips_sampling_without_gpu(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(services.signal, "setitimer", _no_setitimer)
+    s = GpuUtilSampler(interval=0.01)
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    assert s.wait(proc) == 0
+    assert s.summary() is None
+
+def test_sampler_wait__leaves_custom_sigalrm_handler_alone(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def handler(signum: int, frame: object) -> None:
+        pass
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    try:
+        monkeypatch.setattr(services.signal, "setitimer", _no_setitimer)
+        s = GpuUtilSampler(interval=0.01)
+        s._gpu = _FakeGpu()
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.05)"])
+        assert s.wait(proc) == 0
+        assert signal.getsignal(signal.SIGALRM) is handler
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+@pytest.mark.parametrize("interval", [0.0, -1.0])
+def test_sampler_init__rejects_non_positive_interval(interval: float) -> None:
+    with pytest.raises(ValueError, match="interval must be positive"):
+        GpuUtilSampler(interval=interval)
+
+def test_sampler_sample__restores_interval_when_load_moves() -> None:
+    s = GpuUtilSampler(interval=1.0)
+    s._gpu = _SeqGpu([0.0] * 8 + [0.9] + [0.9] * 8)
+    for _ in range(8):
+        s.sample()
+    assert s._interval == 4.0
+    s.sample()
+    assert s._interval == 1.0
+    for _ in range(8):
+        s.sample()
+    assert s._interval == 4.0  # steady again at the new level
+
+def test_spawn__does_not_leak_inheritable_fds() -> None:
+    r, w = os.pipe()
+    os.set_inheritable(w, True)
+    # The child exits 0 only if the descriptor is closed on its side.
+    probe = (
+        "import os, sys\n"
+        "try:\n    os.fstat(int(sys.argv[1]))\n"
+        "except OSError:\n    sys.exit(0)\n"
+        "sys.exit(1)\n"
+    )
+    try:
+        assert _spawn([sys.executable, "-c", probe, str(w)]).wait() == 0
+    finally:
+        os.close(r)
+        os.close(w)
@@ -1,5 +1,10 @@
 from __future__ import annotations
+import json
 from pathlib import Path
+
+import pytest
+
+from rocm_bench.utils import helpers
 from rocm_bench.utils.helpers import ensure_dir
 
 def test_ensure_dir(tmp_path: Path) -> None:
@@ -7,3 +12,41 @@ def test_ensure_dir(tmp_path: Path) -> None:
     ensure_dir(p)
     assert p.exists()
     assert p.is_dir()
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json__roundtrips(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(helpers, "orjson", None)
+    elif helpers.orjson is None:
+        pytest.skip("orjson not installed")
+    p = tmp_path / "r.json"
+    data = {
+        "label": "héllo ✓",
+        "cmd": ["echo", "hi"],
+        "extra": {1: "a"},
+        "total": 0.5,
+        "tiny": 1e-05,
+    }
+    expected = {**data, "extra": {"1": "a"}}
+    helpers.write_json(p, data)
+    text = p.read_text(encoding="utf-8")
+    # Float spelling differs between libraries, so compare decoded values.
+    assert json.loads(text) == expected
+    assert helpers.read_json(p) == expected
+    assert "héllo ✓" in text
+    assert '\n  "label"' in text
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json__leaves_no_file_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(helpers, "orjson", None)
+    elif helpers.orjson is None:
+        pytest.skip("orjson not installed")
+    p = tmp_path / "r.json"
+    with pytest.raises(TypeError):
+        helpers.write_json(p, {"label": "x", "extra": {"obj": object()}})
+    assert not p.exists()